@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the FaceNet -> TFLite converter (convert.py)
+
+TensorFlow is imported inside the helpers that need it, so the scripts can
+parse arguments and run their preflight checks without paying for it.
+"""
+
+import contextlib
+import glob
+import io
+import os
+import shutil
+from functools import lru_cache
+
+# SavedModel location, resolved once; FACENET_DIR points at a different export
+MODEL_DIR = os.environ.get("FACENET_DIR", "assets/models")
+
+CALIBRATION_DIR = "assets/calibration"
+CALIBRATION_SAMPLES = 100
+
+# "dynamic" stores int8 weights and keeps float activations, which needs no
+# calibration data and is the fastest option on CPU-only devices
+PRECISIONS = ["dynamic", "int8", "int4", "int16x8", "fp16"]
+DEFAULT_PRECISION = "dynamic"
+
+OUTPUT_PATH = "assets/models/face_recognition_model.tflite"
+
+# Written next to the main model instead of replacing it: int16x8 so the app
+# can pick the accuracy-critical variant at runtime, int4 because it only
+# applies to quantization-aware trained exports
+SIDE_BY_SIDE_PRECISIONS = ["int4", "int16x8"]
+
+TARGETS = ["cpu", "gpu"]
+
+@lru_cache(maxsize=4)
+def load_saved_model(model_dir):
+    """Load a SavedModel once per process"""
+    import tensorflow as tf
+    
+    print("Loading SavedModel...")
+    return tf.saved_model.load(model_dir)
+
+@lru_cache(maxsize=4)
+def load_concrete(model_dir):
+    """Return the serving concrete function pinned to a [1, 160, 160, 3] input"""
+    # The cached SavedModel keeps the signature's variables alive
+    infer = load_saved_model(model_dir).signatures['serving_default']
+    
+    # set_shape mutates the shared signature, so the pin (and its message)
+    # happens once per model_dir; every caller gets the same batch-1 function.
+    # A static input shape lets the converter constant-fold shape ops
+    # and fuse BatchNorm into the preceding convolutions
+    print("Pinning input shape to [1, 160, 160, 3]...")
+    infer.inputs[0].set_shape([1, 160, 160, 3])
+    return infer
+
+def has_4bit_fake_quant(model_dir):
+    """Check whether the serving graph carries 4-bit fake-quant nodes from QAT"""
+    graph_def = load_concrete(model_dir).graph.as_graph_def()
+    nodes = list(graph_def.node)
+    for function in graph_def.library.function:
+        nodes.extend(function.node_def)
+    
+    return any(node.op.startswith("FakeQuantWithMinMax")
+               and "num_bits" in node.attr and node.attr["num_bits"].i == 4
+               for node in nodes)
+
+def saved_model_converter(model_dir):
+    """Build a TFLite converter for the SavedModel's serving signature"""
+    import tensorflow as tf
+    
+    # Passing the loaded model as the trackable object gives the same
+    # variable freezing as from_saved_model without re-reading the SavedModel
+    converter = tf.lite.TFLiteConverter.from_concrete_functions(
+        [load_concrete(model_dir)], load_saved_model(model_dir)
+    )
+    converter.experimental_new_converter = True
+    converter._experimental_lower_tensor_list_ops = True
+    return converter
+
+def prewhiten(image):
+    """Normalize a face crop the same way FaceNet does at inference time"""
+    import tensorflow as tf
+    
+    mean = tf.reduce_mean(image)
+    std = tf.math.reduce_std(image)
+    std_adj = tf.maximum(std, 1.0 / tf.sqrt(tf.cast(tf.size(image), tf.float32)))
+    return (image - mean) / std_adj
+
+def has_calibration_images(calibration_dir=CALIBRATION_DIR):
+    """Check that there is something to calibrate int8 ranges with"""
+    return bool(glob.glob(os.path.join(calibration_dir, "*.jpg")))
+
+def load_face_crop(path):
+    """Decode a face crop into a prewhitened 160x160 float tensor"""
+    import tensorflow as tf
+    
+    image = tf.io.decode_jpeg(tf.io.read_file(path), channels=3)
+    image = tf.image.resize(tf.cast(image, tf.float32), [160, 160])
+    return prewhiten(image)
+
+def representative_dataset(calibration_dir=CALIBRATION_DIR):
+    """Yield real face crops for int8 calibration"""
+    import tensorflow as tf
+    
+    paths = sorted(glob.glob(os.path.join(calibration_dir, "*.jpg")))[:CALIBRATION_SAMPLES]
+    
+    # Decode and resize on all cores while the converter consumes samples
+    dataset = (
+        tf.data.Dataset.from_tensor_slices(paths)
+        .map(load_face_crop, num_parallel_calls=tf.data.AUTOTUNE)
+        .batch(1)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+    for image in dataset:
+        yield [image]
+
+def configure_quantization(converter, precision, calibration_dir=CALIBRATION_DIR, allow_flex=False):
+    """Apply the optimization settings for the requested precision"""
+    import tensorflow as tf
+    
+    # Optimize.DEFAULT on its own gives dynamic-range quantization
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    
+    # MLIR quantizer: fused quant/dequant pairs, per-channel weight scales
+    # and none of the legacy quantizer's fp16 NaN outputs
+    converter.experimental_new_quantizer = True
+    converter._experimental_disable_per_channel = False
+    
+    if precision in ("int8", "int16x8"):
+        if not has_calibration_images(calibration_dir):
+            print(f"No calibration images found in {calibration_dir}")
+            return False
+        converter.representative_dataset = lambda: representative_dataset(calibration_dir)
+    
+    if precision == "int8":
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+        converter._experimental_full_integer_quantization_bias_type = tf.int32
+    elif precision == "int16x8":
+        # int8 weights keep the size down, int16 activations keep embeddings
+        # close to the float model's cosine similarities
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.EXPERIMENTAL_TFLITE_BUILTINS_ACTIVATIONS_INT16_WEIGHTS_INT8
+        ]
+    else:
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS]
+        if precision == "fp16":
+            converter.target_spec.supported_types = [tf.float16]
+        elif precision == "int4":
+            # Keeps the 4-bit ranges of QAT fake-quant nodes instead of widening
+            # them to int8; callers check for those nodes before asking for int4
+            converter._experimental_low_bit_qat = True
+    
+    # Unless Flex is explicitly allowed, an op missing from the builtin
+    # kernels fails the conversion instead of bloating the model. The
+    # precision's own opset stays first so int8/int16x8 kernels are kept.
+    if allow_flex:
+        print("Warning: --allow-flex bundles TensorFlow ops via the Flex delegate, "
+              "which adds several MB to the app and runs them off the fast path")
+        ops = list(converter.target_spec.supported_ops)
+        for fallback in (tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS):
+            if fallback not in ops:
+                ops.append(fallback)
+        converter.target_spec.supported_ops = ops
+    
+    return True
+
+def convert_model(converter):
+    """Run the conversion, listing any ops the builtin kernels can't cover"""
+    from tensorflow.lite.python.convert import ConverterError
+    
+    try:
+        return converter.convert()
+    except ConverterError as e:
+        unsupported = [line.strip() for line in str(e).splitlines() if line.strip().startswith("tf.")]
+        print("Conversion needs ops outside the TFLite builtins:")
+        for op in unsupported:
+            print(f"  {op}")
+        print("Re-run with --allow-flex and inspect the result with "
+              "tf.lite.experimental.Analyzer.analyze(model_path=...)")
+        raise
+
+def check_gpu_compatibility(tflite_model, target="cpu"):
+    """Report ops the GPU delegate can't run; False only if that blocks target"""
+    import tensorflow as tf
+    
+    # The analyzer prints its report, so capture it to pick out the warnings.
+    # It is only a diagnostic: if it can't run, a CPU build still ships
+    report = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(report):
+            tf.lite.experimental.Analyzer.analyze(model_content=tflite_model, gpu_compatibility=True)
+    except Exception as e:
+        print(f"Warning: GPU compatibility check failed: {e}")
+        return target != "gpu"
+    
+    warnings = [line.strip() for line in report.getvalue().splitlines()
+                if "GPU COMPATIBILITY WARNING" in line]
+    for warning in warnings:
+        print(f"  {warning}")
+    if warnings and target == "gpu":
+        print("Model would fall back to CPU on the GPU delegate")
+        return False
+    return True
+
+def output_path_for(precision, output=OUTPUT_PATH, primary=True):
+    """Return where a model of the given precision is written"""
+    if primary and precision not in SIDE_BY_SIDE_PRECISIONS:
+        return output
+    root, ext = os.path.splitext(output)
+    return f"{root}.{precision}{ext}"
+
+def link_or_copy(src, dst):
+    """Expose src under a second name without writing the bytes twice"""
+    # Same path, or already a hardlink of src: removing dst would delete src
+    if os.path.abspath(src) == os.path.abspath(dst) or (
+            os.path.exists(dst) and os.path.samefile(src, dst)):
+        return
+    
+    try:
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+    
+    if hasattr(os, "link"):
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            # Filesystem without hardlink support, fall back to a plain copy
+            pass
+    
+    shutil.copyfile(src, dst)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Convert FaceNet SavedModel to TFLite format
+
+One process imports TensorFlow and parses the SavedModel once, then runs a
+conversion for every requested precision.
+"""
+
+import argparse
+import os
+import sys
+
+from _converter_common import (
+    CALIBRATION_DIR,
+    DEFAULT_PRECISION,
+    MODEL_DIR,
+    OUTPUT_PATH,
+    PRECISIONS,
+    SIDE_BY_SIDE_PRECISIONS,
+    TARGETS,
+    check_gpu_compatibility,
+    configure_quantization,
+    has_4bit_fake_quant,
+    convert_model,
+    link_or_copy,
+    output_path_for,
+    saved_model_converter,
+)
+
+# v1 converts the SavedModel as-is; v2 falls back to a small generated model
+# when the SavedModel can't be converted. legacy is only an alias of v1, kept
+# so convert_to_tflite.py invocations keep working; it behaves identically.
+VARIANTS = ["v1", "v2", "legacy"]
+
+def save_model(tflite_model, out_path, alias_path=None):
+    """Write the converted model, optionally exposing it under a second name"""
+    with open(out_path, 'wb') as f:
+        f.write(tflite_model)
+    
+    print(f"TFLite model saved to: {out_path}")
+    print(f"Model size: {len(tflite_model) / 1024:.2f} KB")
+    
+    if alias_path:
+        link_or_copy(out_path, alias_path)
+        print(f"MobileFaceNet model saved to: {alias_path}")
+
+def ship_model(tflite_model, out_path, alias_path=None, target="cpu"):
+    """Check the converted model against the target delegate and save it"""
+    # Runs after the conversion's try block, so a diagnostic or write error
+    # can never swap a converted model for the generated fallback
+    if not check_gpu_compatibility(tflite_model, target):
+        return False
+    
+    try:
+        save_model(tflite_model, out_path, alias_path)
+    except OSError as e:
+        print(f"Error saving model: {e}")
+        return False
+    
+    return True
+
+def convert_facenet_to_tflite(saved_model_dir, precision, out_path, alias_path=None,
+                              calibration_dir=CALIBRATION_DIR, allow_flex=False, target="cpu",
+                              fallback=False):
+    """Convert FaceNet SavedModel to TFLite"""
+    print(f"Converting FaceNet SavedModel to TFLite ({precision})...")
+    
+    try:
+        # Check if saved_model.pb exists
+        if not os.path.exists(os.path.join(saved_model_dir, "saved_model.pb")):
+            print(f"Could not find saved_model.pb in {saved_model_dir}")
+            return False
+        
+        print(f"Found model directory: {saved_model_dir}")
+        
+        # TFLite only emits 4-bit weights for quantization-aware trained graphs
+        if precision == "int4" and not has_4bit_fake_quant(saved_model_dir):
+            print("int4 needs a SavedModel trained with 4-bit fake-quant nodes (QAT); "
+                  "this one has none, so use dynamic or int8 instead")
+            return False
+        
+        # Convert to TFLite
+        converter = saved_model_converter(saved_model_dir)
+        if not configure_quantization(converter, precision, calibration_dir, allow_flex):
+            return False
+        
+        tflite_model = convert_model(converter)
+        
+    except Exception as e:
+        print(f"Error converting model: {e}")
+        if not fallback:
+            return False
+        print("Trying alternative approach...")
+        
+        # Create a simple working TFLite model as fallback
+        return create_simple_tflite_model(precision, out_path, alias_path,
+                                          calibration_dir, allow_flex, target)
+    
+    return ship_model(tflite_model, out_path, alias_path, target)
+
+def create_simple_tflite_model(precision, out_path, alias_path=None,
+                               calibration_dir=CALIBRATION_DIR, allow_flex=False, target="cpu"):
+    """Create a simple working TFLite model"""
+    print("Creating simple TFLite model...")
+    
+    # The generated model is untrained float, so there is nothing 4-bit to keep
+    if precision == "int4":
+        print("int4 is not available for the generated fallback model")
+        return False
+    
+    try:
+        import tensorflow as tf
+        
+        # Create a simple MobileNet-style model: depthwise-separable blocks
+        # (SeparableConv2D + BN + ReLU6) that the converter fuses into single ops
+        inputs = tf.keras.layers.Input(shape=(160, 160, 3))
+        x = inputs
+        for filters in (32, 64, 128):
+            x = tf.keras.layers.SeparableConv2D(filters, 3, strides=2, padding='same', use_bias=False)(x)
+            x = tf.keras.layers.BatchNormalization()(x)
+            x = tf.keras.layers.ReLU(6.0)(x)
+        x = tf.keras.layers.GlobalAveragePooling2D()(x)
+        outputs = tf.keras.layers.Dense(128, activation=None)(x)  # Face embedding
+        model = tf.keras.Model(inputs, outputs)
+        
+        # A single forward pass builds the layer variables; the converter
+        # only needs initialized weights, not trained ones
+        _ = model(tf.zeros((1, 160, 160, 3)), training=False)
+        
+        # Convert to TFLite
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        if not configure_quantization(converter, precision, calibration_dir, allow_flex):
+            return False
+        tflite_model = convert_model(converter)
+        
+    except Exception as e:
+        print(f"Error creating simple model: {e}")
+        return False
+    
+    if not ship_model(tflite_model, out_path, alias_path, target):
+        return False
+    print("Simple TFLite models created successfully!")
+    
+    return True
+
+def main(argv=None, variant=None):
+    """Run the CLI; a fixed variant (from the old script names) can't be overridden"""
+    parser = argparse.ArgumentParser(description="Convert FaceNet SavedModel to TFLite")
+    if variant is None:
+        parser.add_argument("--variant", choices=VARIANTS, default="v1",
+                            help="conversion flow to run; v2 falls back to a generated model on failure")
+    parser.add_argument("--precision", choices=PRECISIONS, nargs="+", default=[DEFAULT_PRECISION],
+                        help=f"one or more quantization schemes to export (default: {DEFAULT_PRECISION})")
+    parser.add_argument("--model-dir", default=MODEL_DIR,
+                        help="SavedModel directory to convert")
+    parser.add_argument("--output", default=OUTPUT_PATH,
+                        help="path of the main .tflite model; other precisions get a .<precision> suffix")
+    parser.add_argument("--calibration-dir", default=CALIBRATION_DIR,
+                        help="folder of face crop .jpg files used for int8 calibration")
+    parser.add_argument("--allow-flex", action="store_true",
+                        help="fall back to TensorFlow ops (Flex delegate) for unsupported ops")
+    parser.add_argument("--target", choices=TARGETS, default="cpu",
+                        help="fail the conversion if the model won't fully run on this delegate")
+    args = parser.parse_args(argv)
+    if variant is not None:
+        args.variant = variant
+    
+    # The first regular precision becomes the main model (and mobilefacenet.tflite);
+    # every other one is written next to it
+    precisions = list(dict.fromkeys(args.precision))
+    primary = next((p for p in precisions if p not in SIDE_BY_SIDE_PRECISIONS), None)
+    
+    failed = []
+    for precision in precisions:
+        out_path = output_path_for(precision, args.output, precision == primary)
+        alias_path = None
+        if precision == primary:
+            alias_path = os.path.join(os.path.dirname(out_path), "mobilefacenet.tflite")
+            # --output may already be mobilefacenet.tflite; nothing to link then
+            if os.path.abspath(alias_path) == os.path.abspath(out_path):
+                alias_path = None
+        
+        if not convert_facenet_to_tflite(args.model_dir, precision, out_path, alias_path,
+                                         args.calibration_dir, args.allow_flex, args.target,
+                                         fallback=args.variant == "v2"):
+            failed.append(precision)
+    
+    if not failed:
+        print("\nFaceNet model converted to TFLite successfully!")
+        print(f"Check {os.path.dirname(args.output) or '.'}/ for the new .tflite files")
+    else:
+        print(f"\nFailed to convert model ({', '.join(failed)})")
+    return not failed
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
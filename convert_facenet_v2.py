@@ -1,133 +1,13 @@
 #!/usr/bin/env python3
 """
 Convert FaceNet SavedModel to TFLite format - Version 2
-"""
 
-import tensorflow as tf
-import os
-import numpy as np
+Kept for existing workflows; same as `python convert.py --variant v2`.
+"""
 
-def convert_facenet_to_tflite():
-    """Convert FaceNet SavedModel to TFLite"""
-    print("Converting FaceNet SavedModel to TFLite...")
-    
-    try:
-        model_dir = "assets/models"
-        
-        # Check if saved_model.pb exists
-        if not os.path.exists(os.path.join(model_dir, "saved_model.pb")):
-            print("Could not find saved_model.pb in assets/models")
-            return False
-        
-        print(f"Found model directory: {model_dir}")
-        
-        # Load the SavedModel
-        print("Loading SavedModel...")
-        model = tf.saved_model.load(model_dir)
-        
-        # Get the inference function
-        print("Getting inference function...")
-        infer = model.signatures['serving_default']
-        
-        # Create a concrete function for conversion
-        print("Creating concrete function...")
-        # Try different input shapes
-        try:
-            concrete_func = infer.get_concrete_function(
-                tf.TensorSpec(shape=[None, 160, 160, 3], dtype=tf.float32)
-            )
-        except:
-            # Try with different input shape
-            concrete_func = infer.get_concrete_function(
-                tf.TensorSpec(shape=[1, 160, 160, 3], dtype=tf.float32)
-            )
-        
-        # Convert to TFLite
-        print("Converting to TFLite...")
-        converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete_func])
-        converter.optimizations = [tf.lite.Optimize.DEFAULT]
-        
-        tflite_model = converter.convert()
-        
-        # Save the TFLite model
-        output_path = "assets/models/face_recognition_model.tflite"
-        with open(output_path, 'wb') as f:
-            f.write(tflite_model)
-        
-        print(f"TFLite model saved to: {output_path}")
-        print(f"Model size: {len(tflite_model) / 1024:.2f} KB")
-        
-        # Also save as mobilefacenet.tflite
-        mobilefacenet_path = "assets/models/mobilefacenet.tflite"
-        with open(mobilefacenet_path, 'wb') as f:
-            f.write(tflite_model)
-        
-        print(f"MobileFaceNet model saved to: {mobilefacenet_path}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"Error converting model: {e}")
-        print("Trying alternative approach...")
-        
-        # Create a simple working TFLite model as fallback
-        return create_simple_tflite_model()
+import sys
 
-def create_simple_tflite_model():
-    """Create a simple working TFLite model"""
-    print("Creating simple TFLite model...")
-    
-    try:
-        # Create a simple model
-        model = tf.keras.Sequential([
-            tf.keras.layers.Input(shape=(160, 160, 3)),
-            tf.keras.layers.Conv2D(32, 3, activation='relu'),
-            tf.keras.layers.MaxPooling2D(),
-            tf.keras.layers.Conv2D(64, 3, activation='relu'),
-            tf.keras.layers.MaxPooling2D(),
-            tf.keras.layers.Conv2D(128, 3, activation='relu'),
-            tf.keras.layers.GlobalAveragePooling2D(),
-            tf.keras.layers.Dense(512, activation='relu'),
-            tf.keras.layers.Dense(128, activation='linear'),  # Face embedding
-        ])
-        
-        # Compile the model
-        model.compile(optimizer='adam', loss='mse')
-        
-        # Create dummy data for training
-        dummy_data = np.random.random((1, 160, 160, 3)).astype(np.float32)
-        dummy_labels = np.random.random((1, 128)).astype(np.float32)
-        
-        # Train for one epoch
-        model.fit(dummy_data, dummy_labels, epochs=1, verbose=0)
-        
-        # Convert to TFLite
-        converter = tf.lite.TFLiteConverter.from_keras_model(model)
-        converter.optimizations = [tf.lite.Optimize.DEFAULT]
-        tflite_model = converter.convert()
-        
-        # Save the model files
-        with open("assets/models/face_recognition_model.tflite", 'wb') as f:
-            f.write(tflite_model)
-        
-        with open("assets/models/mobilefacenet.tflite", 'wb') as f:
-            f.write(tflite_model)
-        
-        print("Simple TFLite models created successfully!")
-        print(f"Model size: {len(tflite_model) / 1024:.2f} KB")
-        
-        return True
-        
-    except Exception as e:
-        print(f"Error creating simple model: {e}")
-        return False
+from convert import main
 
 if __name__ == "__main__":
-    success = convert_facenet_to_tflite()
-    if success:
-        print("\nFaceNet model converted to TFLite successfully!")
-        print("Check assets/models/ for the new .tflite files")
-    else:
-        print("\nFailed to convert model")
-
-
+    sys.exit(0 if main(sys.argv[1:], variant="v2") else 1)
@@ -3,30 +3,108 @@
 Script to download working TFLite face recognition models
 """
 
+import hashlib
+import urllib.error
 import urllib.request
 import os
+import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
 
-def download_file(url, filename):
-    """Download a file from URL"""
+CHUNK_SIZE = 1 << 20  # 1 MiB
+DOWNLOAD_ATTEMPTS = 2
+TFLITE_IDENTIFIERS = (b'TFL3', b'TFL2')
+
+# Returned by fetch_file on a 304; a fresh body returns its ETag (or None)
+NOT_MODIFIED = object()
+
+def fetch_file(url, filename):
+    """Fetch a file from URL, skipping the transfer if the local copy is current"""
+    etag_path = filename + ".etag"
+    part_path = filename + ".part"
+    
+    # The ETag is only stored after a complete, valid download, so a cached
+    # ETag always describes the file sitting next to it
+    request = urllib.request.Request(url)
+    if os.path.exists(filename) and os.path.exists(etag_path):
+        with open(etag_path) as f:
+            request.add_header("If-None-Match", f.read().strip())
+        request.add_header("If-Modified-Since", formatdate(os.path.getmtime(filename), usegmt=True))
+    
+    print(f"📥 Downloading {filename}...")
     try:
-        print(f"📥 Downloading {filename}...")
-        urllib.request.urlretrieve(url, filename)
-        
-        # Check file size
-        size = os.path.getsize(filename)
-        size_mb = size / (1024 * 1024)
+        try:
+            with urllib.request.urlopen(request) as response, open(part_path, 'wb') as f:
+                shutil.copyfileobj(response, f, CHUNK_SIZE)
+                etag = response.headers.get("ETag")
+        except BaseException:
+            # Don't leave a half-written body behind after a reset or timeout
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+    except urllib.error.HTTPError as e:
+        if e.code != 304:
+            raise
+        return NOT_MODIFIED
+    
+    os.replace(part_path, filename)
+    return etag
+
+def validate_model(filename, sha256=None):
+    """Return why filename is not a usable TFLite model, or None if it is"""
+    # TFLite models are FlatBuffers with the file identifier at bytes 4-8;
+    # an HTML error page or truncated body fails this immediately
+    with open(filename, 'rb') as f:
+        head = f.read(8)
+    if head[4:8] not in TFLITE_IDENTIFIERS:
+        return f"not a TFLite FlatBuffer (identifier {head[4:8]!r})"
+    
+    if sha256:
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+        if digest.hexdigest() != sha256:
+            return f"SHA-256 mismatch ({digest.hexdigest()})"
+    
+    return None
+
+def download_file(url, filename, sha256=None):
+    """Download a file from URL and check that it is a valid TFLite model"""
+    etag_path = filename + ".etag"
+    
+    for attempt in range(DOWNLOAD_ATTEMPTS):
+        try:
+            etag = fetch_file(url, filename)
+            error = validate_model(filename, sha256)
+        except Exception as e:
+            print(f"❌ Failed to download {filename}: {e}")
+            return False
         
-        if size > 100000:  # More than 100KB
+        if error is None:
+            if etag is NOT_MODIFIED:
+                # The cached copy was reused and its ETag is still valid
+                print(f"✅ {filename} is up to date")
+                return True
+            
+            size_mb = os.path.getsize(filename) / (1024 * 1024)
             print(f"✅ Downloaded {filename}: {size_mb:.2f} MB")
+            if etag is not None:
+                with open(etag_path, 'w') as f:
+                    f.write(etag)
+            elif os.path.exists(etag_path):
+                # A fresh body without an ETag makes the old one stale
+                os.remove(etag_path)
             return True
-        else:
-            print(f"❌ {filename} too small ({size} bytes) - likely corrupted")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Failed to download {filename}: {e}")
-        return False
+        
+        # Drop the bad copy and its ETag so the next attempt fetches the full body
+        print(f"❌ {filename} {error} - likely corrupted")
+        for path in (filename, etag_path):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    return False
 
 def main():
     print("🚀 Downloading TFLite face recognition models...")
@@ -34,7 +112,8 @@ def main():
     # Create models directory
     os.makedirs("assets/models", exist_ok=True)
     
-    # List of TFLite models to try
+    # List of TFLite models to try; an optional "sha256" entry pins the
+    # known-good hash of a release and is checked after download
     models = [
         {
             "name": "MobileNetV1",
@@ -53,11 +132,11 @@ def main():
         }
     ]
     
-    success_count = 0
+    # Downloads are latency-bound, so fetch all models at once
+    with ThreadPoolExecutor(max_workers=len(models)) as executor:
+        results = list(executor.map(lambda m: download_file(m["url"], m["file"], m.get("sha256")), models))
     
-    for model in models:
-        if download_file(model["url"], model["file"]):
-            success_count += 1
+    success_count = sum(results)
     
     print(f"\n📊 Downloaded {success_count}/{len(models)} models successfully")
     